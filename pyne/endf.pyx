@@ -15,6 +15,7 @@ from __future__ import print_function, division, unicode_literals
 
 import re
 import os
+import mmap
 from collections import OrderedDict, Iterable
 from warnings import warn
 from pyne.utils import QAWarning
@@ -23,14 +24,15 @@ cimport numpy as np
 import numpy as np
 from numpy.polynomial.polynomial import Polynomial
 from numpy.polynomial.legendre import Legendre
-from scipy.interpolate import interp1d
 cimport cython
+from libc.string cimport memcpy
 
 from pyne cimport cpp_nucname
+from pyne cimport cpp_utils
 from pyne import nucname
 from pyne import rxdata
 from pyne.rxname import label
-from pyne.utils import fromendf_tok, endftod
+from pyne.utils import fromendf_tok
 
 np.import_array()
 
@@ -44,7 +46,73 @@ FILE1_R = re.compile(r'1451 *\d{1,5}$')
 CONTENTS_R = re.compile(' +\d{1,2} +\d{1,3} +\d{1,10} +')
 SPACE66_R = re.compile(' {66}')
 NUMERICAL_DATA_R = re.compile('[\d\-+. ]{80}\n$')
-SPACE66_R = re.compile(' {66}')
+
+cdef bint _parse_int(char* cs, int start, int stop, long* value):
+    """Parse the integer field cs[start:stop] as int() would: optional
+    surrounding blanks, an optional sign and at least one digit. Returns False
+    if the field is not a valid integer."""
+    cdef int pos = start
+    cdef long sign = 1
+    cdef long result = 0
+    cdef bint has_digits = False
+    while pos < stop and cs[pos] == c' ':
+        pos += 1
+    if pos < stop and (cs[pos] == c'-' or cs[pos] == c'+'):
+        if cs[pos] == c'-':
+            sign = -1
+        pos += 1
+    while pos < stop and c'0' <= cs[pos] <= c'9':
+        result = 10*result + (cs[pos] - c'0')
+        has_digits = True
+        pos += 1
+    while pos < stop and cs[pos] == c' ':
+        pos += 1
+    value[0] = sign*result
+    return has_digits and pos == stop
+
+
+cdef list _cont_fields(line):
+    """Parse the six fields of a CONT-type record in a single compiled pass
+    over the line. The two floating-point fields come first, followed by the
+    four integer fields."""
+    cdef bytes record = line.rstrip('\r\n')[:66].ljust(66).encode()
+    cdef char* cs = record
+    cdef char field[12]
+    cdef int i
+    cdef long value
+    cdef list items = []
+    field[11] = 0
+    for i in range(2):
+        memcpy(field, cs + 11*i, 11)
+        items.append(cpp_utils.endftod(field))
+    for i in range(2, 6):
+        if not _parse_int(cs, 11*i, 11*(i + 1), &value):
+            raise ValueError('Invalid integer field in record: '
+                             '{0!r}'.format(line))
+        items.append(value)
+    return items
+
+
+cpdef tuple _control_numbers(line):
+    """Parse the MAT, MF and MT numbers in columns 67-75 of a record in a
+    single compiled pass, accepting exactly what int() accepts for each."""
+    cdef bytes record = line[66:75].encode()
+    cdef char* cs
+    cdef long MAT, MF, MT
+    if len(record) != 9:
+        raise ValueError('Record is too short to hold MAT, MF and MT '
+                         'numbers: {0!r}'.format(line))
+    cs = record
+    if not (_parse_int(cs, 0, 4, &MAT) and _parse_int(cs, 4, 6, &MF) and
+            _parse_int(cs, 6, 9, &MT)):
+        raise ValueError('Invalid MAT, MF or MT number in record: '
+                         '{0!r}'.format(line))
+    return MAT, MF, MT
+
+
+def _ignore_info(MF, MT):
+    pass
+
 
 def _radiation_type(value):
     p = {0: 'gamma', 1: 'beta-', 2: 'ec/beta+', 3: 'IT',
@@ -394,6 +462,7 @@ class Library(rxdata.RxLib):
 
     def _linlin(self, e_int, xs, low, high):
         if low is not None or high is not None:
+            from scipy.interpolate import interp1d
             interp = interp1d(e_int, xs)
             if low in e_int:
                 xs = xs[e_int >= low]
@@ -414,6 +483,7 @@ class Library(rxdata.RxLib):
 
     def _linlog(self, e_int, xs, low, high):
         if low is not None or high is not None:
+            from scipy.interpolate import interp1d
             interp = interp1d(np.log(e_int), xs)
             if low in e_int:
                 xs = xs[e_int >= low]
@@ -442,6 +512,7 @@ class Library(rxdata.RxLib):
 
     def _loglin(self, e_int, xs, low, high):
         if low is not None or high is not None:
+            from scipy.interpolate import interp1d
             interp = interp1d(e_int, np.log(xs))
             if low in e_int:
                 xs = xs[e_int >= low]
@@ -469,6 +540,7 @@ class Library(rxdata.RxLib):
 
     def _loglog(self, e_int, xs, low, high):
         if low is not None or high is not None:
+            from scipy.interpolate import interp1d
             interp = interp1d(np.log(e_int), np.log(xs))
             if low in e_int:
                 xs = xs[e_int >= low]
@@ -1145,6 +1217,102 @@ def seek_section_end(f):
             break
 
 
+def _read_values(fh, n_values):
+    """Read a block of numbers stored six to a line and convert them all at
+    once rather than field by field.
+
+    Parameters
+    ----------
+    fh : file_like
+        File positioned at the first line of the block
+    n_values : int
+        Number of values in the block
+
+    Returns
+    -------
+    ndarray
+        Array of length n_values
+
+    """
+    cdef Py_ssize_t i, n_lines
+    n_lines = (n_values + 5)//6
+    # Only the first 66 columns hold data; drop the line terminator and pad
+    # each line to the 81-character record that fromendf_tok expects in case
+    # trailing blanks were stripped.
+    data = ''.join([fh.readline().rstrip('\r\n')[:66].ljust(81)
+                    for i in range(n_lines)])
+    return fromendf_tok(data)[:n_values]
+
+
+def _read_ints(fh, n_values, int first_field=0):
+    """Read a block of integers stored six to a line, parsing each field as
+    int() would rather than as a real.
+
+    Parameters
+    ----------
+    fh : file_like
+        File positioned at the first line of the block
+    n_values : int
+        Number of values in the block
+    first_field : int, optional
+        Index of the first field holding a value on each line. Fields before
+        it, such as the C1 and C2 fields of a CONT record, are not read.
+
+    Returns
+    -------
+    ndarray
+        Integer array of length n_values
+
+    Raises
+    ------
+    ValueError
+        If any field in the block is not a valid integer
+
+    """
+    cdef bytes record
+    cdef char* cs
+    cdef Py_ssize_t i, j, per_line, n_fields
+    cdef long value
+    cdef list values = []
+    per_line = 6 - first_field
+    for i in range(0, n_values, per_line):
+        line = fh.readline()
+        record = line.rstrip('\r\n')[:66].ljust(66).encode()
+        cs = record
+        n_fields = min(per_line, n_values - i)
+        for j in range(first_field, first_field + n_fields):
+            if not _parse_int(cs, 11*j, 11*(j + 1), &value):
+                raise ValueError('Invalid integer field in record: '
+                                 '{0!r}'.format(line))
+            values.append(value)
+    return np.array(values, dtype=int)
+
+
+class _LineReader(object):
+    """Text view of a binary ENDF file that decodes one line at a time.
+
+    Positions reported by tell() and accepted by seek() are byte offsets into
+    the underlying object, so they can be computed from record numbers.
+
+    Parameters
+    ----------
+    binary : file_like
+        Object opened in binary mode providing readline(), tell() and seek()
+
+    """
+
+    def __init__(self, binary):
+        self._binary = binary
+        self.tell = binary.tell
+        self.seek = binary.seek
+
+    def readline(self):
+        line = self._binary.readline()
+        if line.endswith(b'\r\n'):
+            line = line[:-2] + b'\n'
+        return line.decode('utf-8')
+
+
 class Evaluation(object):
     """ENDF material evaluation with multiple files/sections
 
@@ -1230,12 +1398,23 @@ class Evaluation(object):
     """
 
     def __init__(self, filename_or_handle, verbose=True):
+        self._section_ends = None
+        self._file_ends = None
         if hasattr(filename_or_handle, 'read'):
             self._fh = filename_or_handle
         else:
-            self._fh = open(filename_or_handle, 'rU')
+            # Serve lines straight from a read-only mapping of the file,
+            # decoding each one only as the parser asks for it
+            with open(filename_or_handle, 'rb') as fh:
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index_records(mapped)
+            self._fh = _LineReader(mapped)
         self._verbose = verbose
         self._veryverbose = False
+        if not verbose:
+            # Every reader reports its section through _print_info, so replace
+            # it outright rather than testing the flag on each call
+            self._print_info = _ignore_info
 
         # Create public attributes
         self.atomic_relaxation = {}
@@ -1251,13 +1430,49 @@ class Evaluation(object):
         self.thermal_elastic = {}
         self.thermal_inelastic = {}
 
+        # Readers for individual sections, keyed by (MF, MT)
+        self._section_readers = {
+            (1, 452): self._read_total_nu,
+            (1, 455): self._read_delayed_nu,
+            (1, 456): self._read_prompt_nu,
+            (1, 458): self._read_fission_energy,
+            (1, 460): self._read_delayed_photon,
+            (2, 151): self._read_resonances,
+            (7, 2): self._read_thermal_elastic,
+            (7, 4): self._read_thermal_inelastic,
+            (8, 454): self._read_independent_yield,
+            (8, 457): self._read_decay,
+            (8, 459): self._read_cumulative_yield,
+            (28, 533): self._read_atomic_relaxation}
+
+        # Readers for any other section of a file, called with the MT number.
+        # Files not listed here are skipped entirely.
+        self._file_readers = {
+            1: self._skip_section,
+            2: self._skip_section,
+            3: self._read_reaction_xs,
+            4: self._read_angular_distribution,
+            5: self._read_energy_distribution,
+            6: self._read_product_energy_angle,
+            7: self._skip_section,
+            8: self._read_radioactive_nuclide,
+            9: self._read_multiplicity,
+            10: self._read_production_xs,
+            12: self._read_photon_production_yield,
+            13: self._read_photon_production_xs,
+            14: self._read_photon_angular_distribution,
+            15: self._read_photon_energy_distribution,
+            23: self._read_photon_interaction,
+            26: self._read_electron_products,
+            27: self._read_scattering_functions}
+
         # Determine MAT number for this evaluation
         MF = 0
         while MF == 0:
             position = self._fh.tell()
             line = self._fh.readline()
-            MF = int(line[70:72])
-        self.material = int(line[66:70])
+            MAT, MF, MT = _control_numbers(line)
+        self.material = MAT
 
         # Save starting position for this evaluation
         self._fh.seek(position)
@@ -1284,23 +1499,34 @@ class Evaluation(object):
             Reactions (MT) which should not be read
 
         """
-
         # Make sure file is positioned correctly
         self._fh.seek(self._start_position)
 
         if isinstance(reactions, tuple):
             reactions = [reactions]
 
+        # These are checked for every section in the file, so test membership
+        # against sets rather than scanning the lists each time
+        if reactions:
+            reactions = set(reactions)
+        skip_mf = set(skip_mf)
+        skip_mt = set(skip_mt)
+
+        # Look up the bound methods used for every section once, up front
+        tell = self._fh.tell
+        readline = self._fh.readline
+        seek = self._fh.seek
+        section_reader = self._section_readers.get
+        file_readers = self._file_readers
+
         while True:
             # Find next section
             while True:
-                position = self._fh.tell()
-                line = self._fh.readline()
-                MAT = int(line[66:70])
-                MF = int(line[70:72])
-                MT = int(line[72:75])
+                position = tell()
+                line = readline()
+                MAT, MF, MT = _control_numbers(line)
                 if MT > 0 or MAT == 0:
-                    self._fh.seek(position)
+                    seek(position)
                     break
 
             # If end of material reached, exit loop
@@ -1309,118 +1535,25 @@ class Evaluation(object):
 
             # If there are files/reactions requested to be skipped, check them
             if MF in skip_mf:
-                seek_file_end(self._fh)
+                self._seek_file_end()
                 continue
             if MT in skip_mt:
-                seek_section_end(self._fh)
+                self._seek_section_end()
                 continue
 
             # If reading is restricted to certain reactions, check here
             if reactions and (MF, MT) not in reactions:
-                seek_section_end(self._fh)
+                self._seek_section_end()
                 continue
 
-
-            # File 1 data
-            if MF == 1:
-                if MT == 452:
-                    # Number of total neutrons per fission
-                    self._read_total_nu()
-                elif MT == 455:
-                    # Number of delayed neutrons per fission
-                    self._read_delayed_nu()
-                elif MT == 456:
-                    # Number of prompt neutrons per fission
-                    self._read_prompt_nu()
-                elif MT == 458:
-                    # Components of energy release due to fission
-                    self._read_fission_energy()
-                elif MT == 460:
-                    self._read_delayed_photon()
-
-            elif MF == 2:
-                # Resonance parameters
-                if MT == 151:
-                    self._read_resonances()
-                else:
-                    seek_section_end(self._fh)
-
-            elif MF == 3:
-                # Reaction cross sections
-                self._read_reaction_xs(MT)
-
-            elif MF == 4:
-                # Angular distributions
-                self._read_angular_distribution(MT)
-
-            elif MF == 5:
-                # Energy distributions
-                self._read_energy_distribution(MT)
-
-            elif MF == 6:
-                # Product energy-angle distributions
-                self._read_product_energy_angle(MT)
-
-            elif MF == 7:
-                # Thermal scattering data
-                if MT == 2:
-                    self._read_thermal_elastic()
-                if MT == 4:
-                    self._read_thermal_inelastic()
-
-            elif MF == 8:
-                # decay and fission yield data
-                if MT == 454:
-                    self._read_independent_yield()
-                elif MT == 459:
-                    self._read_cumulative_yield()
-                elif MT == 457:
-                    self._read_decay()
-                else:
-                    self._read_radioactive_nuclide(MT)
-
-            elif MF == 9:
-                # multiplicities
-                self._read_multiplicity(MT)
-
-            elif MF == 10:
-                # cross sections for production of radioactive nuclides
-                self._read_production_xs(MT)
-
-            elif MF == 12:
-                # Photon production yield data
-                self._read_photon_production_yield(MT)
-
-            elif MF == 13:
-                # Photon production cross sections
-                self._read_photon_production_xs(MT)
-
-            elif MF == 14:
-                # Photon angular distributions
-                self._read_photon_angular_distribution(MT)
-
-            elif MF == 15:
-                # Photon continuum energy distributions
-                self._read_photon_energy_distribution(MT)
-
-            elif MF == 23:
-                # photon interaction data
-                self._read_photon_interaction(MT)
-
-            elif MF == 26:
-                # secondary distributions for photon interactions
-                self._read_electron_products(MT)
-
-            elif MF == 27:
-                # atomic form factors or scattering functions
-                self._read_scattering_functions(MT)
-
-            elif MF == 28:
-                # atomic relaxation data
-                self._read_atomic_relaxation()
-
+            # Dispatch to the reader for this section or file
+            reader = section_reader((MF, MT))
+            if reader is not None:
+                reader()
+            elif MF in file_readers:
+                file_readers[MF](MT)
             else:
-                seek_file_end(self._fh)
+                self._seek_file_end()
 
     def _read_header(self):
         self._print_info(1, 451)
@@ -1478,11 +1611,12 @@ class Evaluation(object):
             self.info['identifier'] = text[2:5]
             self.info['description'] = text[5:]
 
-        # File numbers, reaction designations, and number of records
-        for i in range(NXC):
-            items = self._get_cont_record(skipC=True)
-            MF, MT, NC, MOD = items[2:6]
-            self.reaction_list.append((MF, MT, NC, MOD))
+        # File numbers, reaction designations, and number of records. The
+        # directory is one CONT record per section, so read its four integer
+        # fields as a block.
+        directory = _read_ints(self._fh, 4*NXC, first_field=2)
+        self.reaction_list.extend(
+            map(tuple, directory.reshape(NXC, 4).tolist()))
 
     def _read_total_nu(self):
         self._print_info(1, 452)
@@ -2591,30 +2725,20 @@ class Evaluation(object):
             print('Get CONT record')
         if not line:
             line = self._fh.readline()
+        items = _cont_fields(line)
         if skipC:
-            C1 = None
-            C2 = None
-        else:
-            C1 = endftod(line[:11])
-            C2 = endftod(line[11:22])
-        L1 = int(line[22:33])
-        L2 = int(line[33:44])
-        N1 = int(line[44:55])
-        N2 = int(line[55:66])
-        return [C1, C2, L1, L2, N1, N2]
+            items[0] = None
+            items[1] = None
+        return items
 
     def _get_head_record(self, line=None):
         if not line:
             line = self._fh.readline()
         if self._veryverbose:
             print('Get HEAD record')
-        ZA = int(endftod(line[:11]))
-        AWR = endftod(line[11:22])
-        L1 = int(line[22:33])
-        L2 = int(line[33:44])
-        N1 = int(line[44:55])
-        N2 = int(line[55:66])
-        return [ZA, AWR, L1, L2, N1, N2]
+        items = _cont_fields(line)
+        items[0] = int(items[0])
+        return items
 
     def _get_list_record(self, onlyList=False):
         # determine how many items are in list
@@ -2624,16 +2748,7 @@ class Evaluation(object):
         NPL = items[4]
 
         # read items
-        itemsList = []
-        m = 0
-        for i in range((NPL-1)//6 + 1):
-            line = self._fh.readline()
-            toRead = min(6, NPL-m)
-            for j in range(toRead):
-                val = endftod(line[0:11])
-                itemsList.append(val)
-                line = line[11:]
-            m = m + toRead
+        itemsList = _read_values(self._fh, NPL).tolist()
         if onlyList:
             return itemsList
         else:
@@ -2652,6 +2767,52 @@ class Evaluation(object):
         return r
 
 
+    def _index_records(self, raw):
+        # When every line is a full 81-character record, locate all SEND and
+        # FEND records up front with array operations so that skipping a
+        # section or file is a binary search rather than a readline() loop.
+        # Records ending in a carriage return as well are 82 bytes long.
+        line_length = 82 if raw[80:82] == b'\r\n' else 81
+        n_lines, remainder = divmod(len(raw), line_length)
+        if (remainder != 0 or
+                raw[line_length - 1::line_length] != b'\n'*n_lines):
+            return
+        if line_length == 82 and raw[80::82] != b'\r'*n_lines:
+            return
+        lines = np.frombuffer(raw, dtype=np.uint8)
+        lines = lines.reshape(n_lines, line_length)
+        blank, zero = ord(' '), ord('0')
+        self._section_ends = np.flatnonzero((lines[:, 72] == blank) &
+                                            (lines[:, 73] == blank) &
+                                            (lines[:, 74] == zero))
+        self._file_ends = np.flatnonzero((lines[:, 70] == blank) &
+                                         (lines[:, 71] == zero))
+        self._line_length = line_length
+
+    def _seek_record_after(self, ends):
+        # Position the file just past the first record in ends at or after the
+        # current line, or at the end of the file if there is none
+        i = np.searchsorted(ends, self._fh.tell()//self._line_length)
+        if i < len(ends):
+            self._fh.seek(self._line_length*(int(ends[i]) + 1))
+        else:
+            self._fh.seek(0, os.SEEK_END)
+
+    def _skip_section(self, MT):
+        self._seek_section_end()
+
+    def _seek_section_end(self):
+        if self._section_ends is None:
+            seek_section_end(self._fh)
+        else:
+            self._seek_record_after(self._section_ends)
+
+    def _seek_file_end(self):
+        if self._file_ends is None:
+            seek_file_end(self._fh)
+        else:
+            self._seek_record_after(self._file_ends)
+
     def _print_info(self, MF, MT):
         if self._verbose:
             print('Reading MF={0}, MT={1} {2}'.format(MF, MT, label(MT)))
@@ -2683,6 +2844,8 @@ class Tab1(object):
 
     """
 
+    __slots__ = ('n_regions', 'nbt', 'interp', 'n_pairs', 'x', 'y')
+
     def __init__(self, x, y, nbt, interp):
         if len(nbt) == 0 and len(interp) == 0:
             self.n_regions = 1
@@ -2710,40 +2873,20 @@ class Tab1(object):
         """
 
         # Determine how many interpolation regions and total points there are
-        line = fh.readline()
-        C1 = endftod(line[:11])
-        C2 = endftod(line[11:22])
-        L1 = int(line[22:33])
-        L2 = int(line[33:44])
-        n_regions = int(line[44:55])
-        n_pairs = int(line[55:66])
-        params = [C1, C2, L1, L2]
+        items = _cont_fields(fh.readline())
+        n_regions = items[4]
+        n_pairs = items[5]
+        params = items[:4]
 
         # Read the interpolation region data, namely NBT and INT
-        nbt = np.zeros(n_regions)
-        interp = np.zeros(n_regions)
-        m = 0
-        for i in range((n_regions - 1)//3 + 1):
-            line = fh.readline()
-            toRead = min(3, n_regions - m)
-            for j in range(toRead):
-                nbt[m] = int(line[0:11])
-                interp[m] = int(line[11:22])
-                line = line[22:]
-                m += 1
+        values = _read_ints(fh, 2*n_regions)
+        nbt = values[0::2]
+        interp = values[1::2]
 
         # Read tabulated pairs x(n) and y(n)
-        x = np.zeros(n_pairs)
-        y = np.zeros(n_pairs)
-        m = 0
-        for i in range((n_pairs - 1)//3 + 1):
-            line = fh.readline()
-            toRead = min(3, n_pairs - m)
-            for j in range(toRead):
-                x[m] = endftod(line[:11])
-                y[m] = endftod(line[11:22])
-                line = line[22:]
-                m += 1
+        values = _read_values(fh, 2*n_pairs)
+        x = values[0::2]
+        y = values[1::2]
 
         return params, cls(x, y, nbt, interp)
 
@@ -3029,33 +3172,21 @@ class MadlandNix(EnergyDistribution):
 
 
 class ENDFTab2Record(object):
+    __slots__ = ('NBT', 'INT', 'params')
+
     def __init__(self):
-        self.NBT = []
-        self.INT = []
+        self.NBT = np.empty(0, dtype=int)
+        self.INT = np.empty(0, dtype=int)
 
     def read(self, fh):
         # Determine how many interpolation regions and total points there are
-        line = fh.readline()
-        C1 = endftod(line[:11])
-        C2 = endftod(line[11:22])
-        L1 = int(line[22:33])
-        L2 = int(line[33:44])
-        NR = int(line[44:55])
-        NZ = int(line[55:66])
-        self.params = [C1, C2, L1, L2, NR, NZ]
+        self.params = _cont_fields(fh.readline())
+        NR = self.params[4]
 
         # Read the interpolation region data, namely NBT and INT
-        m = 0
-        for i in range((NR-1)//3 + 1):
-            line = fh.readline()
-            toRead = min(3,NR-m)
-            for j in range(toRead):
-                NBT = int(line[0:11])
-                INT = int(line[11:22])
-                self.NBT.append(NBT)
-                self.INT.append(INT)
-                line = line[22:]
-            m = m + toRead
+        values = _read_ints(fh, 2*NR)
+        self.NBT = values[0::2]
+        self.INT = values[1::2]
 
 
 class AngularDistribution(object):
@@ -3123,6 +3254,14 @@ class Reaction(object):
 
     """
 
+    __slots__ = ('mt', 'files', 'photon_production', 'xs', 'Q_mass_difference',
+                 'Q_reaction', 'complex_breakup_flag', 'angular_distribution',
+                 'energy_distribution', 'product_distribution',
+                 'reference_frame', 'radionuclide_production', 'multiplicities',
+                 'production', 'subshell_binding_energy', 'fluorescence_yield',
+                 'products', 'scattering_factor',
+                 'anomalous_scattering_imaginary', 'anomalous_scattering_real')
+
     def __init__(self, mt):
         self.mt = mt
         self.files = []
@@ -5,7 +5,7 @@ from math import e
 from hashlib import md5
 
 import nose
-from nose.tools import assert_equal
+from nose.tools import assert_equal, assert_raises
 
 import numpy as np
 from numpy.testing import assert_array_equal, assert_allclose, \
@@ -14,7 +14,8 @@ from numpy.testing import assert_array_equal, assert_allclose, \
 from pyne.utils import QAWarning
 warnings.simplefilter("ignore", QAWarning)
 
-from pyne.endf import Library, Evaluation
+from pyne.endf import Library, Evaluation, Tab1, ENDFTab2Record, \
+    _control_numbers
 from pyne.utils import endftod
 from pyne.rxdata import DoubleSpinDict
 from pyne.xs.data_source import ENDFDataSource
@@ -867,5 +868,217 @@ def test_evaluation_relaxation():
     assert data['O3']['transitions'] == []
 
 
+def test_tab1_from_file():
+    tab1 = io.StringIO(
+        u' 1.000000+0 2.000000+0          0          0          2          5 128 3  1    1\n'
+        u'          2          1          5          2                       128 3  1    2\n'
+        u' 1.000000-5 2.500000+1 1.000000+0 1.250000+1 2.000000+0 1.000000+1 128 3  1    3\n'
+        u' 1.000000+6 3.000000+0 2.000000+7-1.500000-2                       128 3  1    4\n')
+    params, f = Tab1.from_file(tab1)
+    assert params == [1.0, 2.0, 0, 0]
+    assert_array_equal(f.nbt, [2, 5])
+    assert_array_equal(f.interp, [1, 2])
+    assert_allclose(f.x, [1.0e-5, 1.0, 2.0, 1.0e6, 2.0e7])
+    assert_allclose(f.y, [25.0, 12.5, 10.0, 3.0, -1.5e-2])
+    assert tab1.readline() == u''
+
+
+def test_tab1_from_file_misaligned_header():
+    # A float in an integer column must not be read as a point count
+    tab1 = io.StringIO(
+        u' 1.000000+0 2.000000+0 1.000000+3          0          1          2 128 3  1    1\n'
+        u'          2          2                                             128 3  1    2\n'
+        u' 1.000000-5 2.500000+1 1.000000+0 1.250000+1                       128 3  1    3\n')
+    assert_raises(ValueError, Tab1.from_file, tab1)
+
+
+def test_tab1_from_file_misaligned_nbt():
+    # Nor a float in an interpolation region column as a breakpoint
+    tab1 = io.StringIO(
+        u' 1.000000+0 2.000000+0          0          0          1          2 128 3  1    1\n'
+        u' 1.000000+3          2                                             128 3  1    2\n'
+        u' 1.000000-5 2.500000+1 1.000000+0 1.250000+1                       128 3  1    3\n')
+    assert_raises(ValueError, Tab1.from_file, tab1)
+
+def test_tab1_from_file_short_lines():
+    # Trailing blanks and the MAT/MF/MT/NS columns stripped from every line,
+    # including the blank (zero) y value of the last pair
+    tab1 = io.StringIO(
+        u' 0.000000+0 0.000000+0          0          0          1          5\n'
+        u'          5          2\n'
+        u' 1.000000-5 2.500000+1 1.000000+0 1.250000+1 2.000000+0 1.000000+1\n'
+        u' 1.000000+6 3.000000+0 2.000000+7\n')
+    params, f = Tab1.from_file(tab1)
+    assert_array_equal(f.nbt, [5])
+    assert_array_equal(f.interp, [2])
+    assert_allclose(f.x, [1.0e-5, 1.0, 2.0, 1.0e6, 2.0e7])
+    assert_allclose(f.y, [25.0, 12.5, 10.0, 3.0, 0.0])
+
+
+def test_tab2_read():
+    tab2 = ENDFTab2Record()
+    tab2.read(io.StringIO(
+        u' 0.000000+0 0.000000+0          0          0          4          9 128 7  4    1\n'
+        u'          2          1          5          2          7          3 128 7  4    2\n'
+        u'          9          4                                             128 7  4    3\n'))
+    assert tab2.params == [0.0, 0.0, 0, 0, 4, 9]
+    assert_array_equal(tab2.NBT, [2, 5, 7, 9])
+    assert_array_equal(tab2.INT, [1, 2, 3, 4])
+
+    # A real in a breakpoint column must not be truncated to an integer
+    assert_raises(ValueError, ENDFTab2Record().read, io.StringIO(
+        u' 0.000000+0 0.000000+0          0          0          1          9 128 7  4    1\n'
+        u' 9.000000+0          4                                             128 7  4    2\n'))
+
+def endf_float(x):
+    """Format x as an 11-column ENDF real, e.g. ' 1.000000+0'."""
+    mantissa, exponent = '{0:.6e}'.format(x).split('e')
+    return '{0:>9}{1:+d}'.format(mantissa, int(exponent))
+
+
+def endf_record(items, MAT, MF, MT, NS):
+    """Format up to six ENDF fields followed by the control numbers."""
+    fields = ''
+    for item in items:
+        if item is None:
+            fields += ' '*11
+        elif isinstance(item, float):
+            fields += endf_float(item)
+        else:
+            fields += '{0:11d}'.format(item)
+    return u'{0:66}{1:4d}{2:2d}{3:3d}{4:5d}\n'.format(fields, MAT, MF, MT, NS)
+
+
+def synthetic_material(extra=()):
+    """Return the text of a tape holding one small material with MT=1, 2 and
+    102 cross sections in MF=3 and a one-record section for each (MF, MT)
+    in extra."""
+    MAT = 128
+    sections = {3: [1, 2, 102]}
+    for MF, MT in extra:
+        sections.setdefault(MF, []).append(MT)
+    directory = [(MF, MT) for MF in sorted(sections) for MT in sections[MF]]
+
+    lines = [u'{0:66}{1:4d}{2:2d}{3:3d}{4:5d}\n'.format('synthetic tape', 1,
+                                                         0, 0, 0)]
+    header = [[1001.0, 0.999167, 0, 0, 0, 0],
+              [0.0, 0.0, 0, 0, 0, 6],
+              [1.0, 2.0e7, 0, 0, 10, 8],
+              [0.0, 0.0, 0, 0, 1, len(directory) + 1],
+              []]
+    header += [[None, None, MF, MT, 4, 0]
+               for MF, MT in [(1, 451)] + directory]
+    for MF in sorted(set(sections) | set([1])):
+        if MF == 1:
+            lines += [endf_record(items, MAT, 1, 451, i + 1)
+                      for i, items in enumerate(header)]
+            lines.append(endf_record([], MAT, 1, 0, 99999))
+        for MT in sections.get(MF, []):
+            if MF == 3:
+                records = [[1001.0, 0.999167, 0, 0, 0, 0],
+                           [0.0, 0.0, 0, 0, 1, 3],
+                           [3, 2],
+                           [1.0e-5, float(MT), 1.0e6, 2.0*MT, 2.0e7, 3.0*MT]]
+            else:
+                records = [[0.0, 0.0, 0, 0, 0, 0]]
+            lines += [endf_record(items, MAT, MF, MT, i + 1)
+                      for i, items in enumerate(records)]
+            lines.append(endf_record([], MAT, MF, 0, 99999))
+        lines.append(endf_record([], MAT, 0, 0, 0))
+    lines.append(endf_record([], 0, 0, 0, 0))
+    lines.append(endf_record([], -1, 0, 0, 0))
+    return u''.join(lines)
+
+
+def test_evaluation_file_matches_handle():
+    # A filename is indexed so that skipped sections and files are found by
+    # binary search, while a handle is scanned line by line; both must agree
+    filename = 'synthetic.endf'
+    with open(filename, 'w') as fh:
+        fh.write(synthetic_material())
+    try:
+        for kwargs in [{}, {'skip_mf': [3]}, {'skip_mt': [2]},
+                       {'reactions': [(3, 102)]}]:
+            from_file = Evaluation(filename, verbose=False)
+            from_handle = Evaluation(io.StringIO(synthetic_material()),
+                                     verbose=False)
+            assert from_file._section_ends is not None
+            assert from_handle._section_ends is None
+            from_file.read(**kwargs)
+            from_handle.read(**kwargs)
+            assert_equal(list(from_file.reactions),
+                         list(from_handle.reactions))
+            for MT, rx in from_file.reactions.items():
+                assert_array_equal(rx.xs.x, from_handle.reactions[MT].xs.x)
+                assert_array_equal(rx.xs.y, from_handle.reactions[MT].xs.y)
+        assert_equal(list(from_file.reactions), [102])
+    finally:
+        if os.path.isfile(filename):
+            os.remove(filename)
+
+
+def test_evaluation_crlf_file_matches_handle():
+    # Records with Windows line endings are indexed as 82-byte lines
+    filename = 'synthetic_crlf.endf'
+    text = synthetic_material()
+    with open(filename, 'wb') as fh:
+        fh.write(text.replace(u'\n', u'\r\n').encode())
+    try:
+        for kwargs in [{}, {'skip_mf': [3]}, {'skip_mt': [2]},
+                       {'reactions': [(3, 102)]}]:
+            from_file = Evaluation(filename, verbose=False)
+            from_handle = Evaluation(io.StringIO(text), verbose=False)
+            assert from_file._section_ends is not None
+            assert_equal(from_file._line_length, 82)
+            from_file.read(**kwargs)
+            from_handle.read(**kwargs)
+            assert_equal(list(from_file.reactions),
+                         list(from_handle.reactions))
+            for MT, rx in from_file.reactions.items():
+                assert_array_equal(rx.xs.x, from_handle.reactions[MT].xs.x)
+                assert_array_equal(rx.xs.y, from_handle.reactions[MT].xs.y)
+    finally:
+        if os.path.isfile(filename):
+            os.remove(filename)
+
+def test_evaluation_unknown_sections():
+    # Sections in MF=1 and MF=7 with no dedicated reader must be skipped
+    # rather than leaving read() looking at the same record forever
+    ev = Evaluation(io.StringIO(synthetic_material([(1, 457), (7, 451)])),
+                    verbose=False)
+    ev.read()
+    assert_equal(list(ev.reactions), [1, 2, 102])
+    assert (1, 457, 4, 0) in ev.reaction_list
+    assert (7, 451, 4, 0) in ev.reaction_list
+    assert_allclose(ev.reactions[102].xs.y, [102.0, 204.0, 306.0])
+
+
+def test_evaluation_corrupt_directory():
+    # A real in an integer column of the MF=1/MT=451 directory is an error,
+    # while the unused C1 and C2 fields are not read at all
+    text = synthetic_material()
+    entry = u' '*32 + u'3        102          4          0'
+    assert entry in text
+    bad = text.replace(entry, entry[:33] + u' 1.020000+2' + entry[44:])
+    assert_raises(ValueError, Evaluation, io.StringIO(bad), verbose=False)
+    unused = text.replace(entry, u'    unused' + entry[10:])
+    ev = Evaluation(io.StringIO(unused), verbose=False)
+    assert (3, 102, 4, 0) in ev.reaction_list
+
+def test_control_numbers():
+    data = u' 1.000000+0 2.000000+0          0          0          2          5'
+    assert_equal(_control_numbers(data + u' 128 3  1    1\n'), (128, 3, 1))
+    assert_equal(_control_numbers(data + u'9228 3102   12\n'), (9228, 3, 102))
+    # TEND record and signed fields, as int() accepts them
+    assert_equal(_control_numbers(data + u'  -1 0  0    0\n'), (-1, 0, 0))
+    assert_equal(_control_numbers(data + u'+128+3 +1    1\n'), (128, 3, 1))
+    # Blank fields, embedded spaces and short lines are rejected
+    assert_raises(ValueError, _control_numbers, data + u'     3  1    1\n')
+    assert_raises(ValueError, _control_numbers, data + u' 128 3   \n')
+    assert_raises(ValueError, _control_numbers, data + u'92 8 3  1    1\n')
+    assert_raises(ValueError, _control_numbers, data + u' 128- 3  1    1\n')
+    assert_raises(ValueError, _control_numbers, data + u' 128\n')
+
+
 if __name__ == "__main__":
     nose.runmodule()